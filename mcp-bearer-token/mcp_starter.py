@@ -1,16 +1,18 @@
 import asyncio
 from typing import Annotated
 import os
+from dataclasses import dataclass, asdict
 from dotenv import load_dotenv
 from fastmcp import FastMCP
 from fastmcp.server.auth.providers.bearer import BearerAuthProvider, RSAKeyPair
 from mcp import ErrorData, McpError
 from mcp.server.auth.provider import AccessToken
 from mcp.types import TextContent, ImageContent, INVALID_PARAMS, INTERNAL_ERROR
-from pydantic import BaseModel, Field, AnyUrl
+from pydantic import Field, AnyUrl
 
 import markdownify
 import httpx
+import orjson
 import readabilipy
 
 # --- Load environment variables ---
@@ -40,11 +42,16 @@ class SimpleBearerAuthProvider(BearerAuthProvider):
         return None
 
 # --- Rich Tool Description model ---
-class RichToolDescription(BaseModel):
+# plain constants that are only ever serialized, so no pydantic model needed
+@dataclass(frozen=True, slots=True)
+class RichToolDescription:
     description: str
     use_when: str
     side_effects: str | None = None
 
+def _desc_json(d: RichToolDescription) -> str:
+    return orjson.dumps(asdict(d)).decode()
+
 # --- Fetch Utility Class ---
 class Fetch:
     USER_AGENT = "Puch/1.0 (Autonomous)"
@@ -140,8 +147,9 @@ JobFinderDescription = RichToolDescription(
     use_when="Use this to evaluate job descriptions or search for jobs using freeform goals.",
     side_effects="Returns insights, fetched job descriptions, or relevant job links.",
 )
+_JOB_FINDER_DESC_JSON = _desc_json(JobFinderDescription)
 
-@mcp.tool(description=JobFinderDescription.model_dump_json())
+@mcp.tool(description=_JOB_FINDER_DESC_JSON)
 async def job_finder(
     user_goal: Annotated[str, Field(description="The user's goal (can be a description, intent, or freeform query)")],
     job_description: Annotated[str | None, Field(description="Full job description text, if available.")] = None,
@@ -184,8 +192,9 @@ MAKE_IMG_BLACK_AND_WHITE_DESCRIPTION = RichToolDescription(
     use_when="Use this tool when the user provides an image URL and requests it to be converted to black and white.",
     side_effects="The image will be processed and saved in a black and white format.",
 )
+_MAKE_IMG_BLACK_AND_WHITE_DESC_JSON = _desc_json(MAKE_IMG_BLACK_AND_WHITE_DESCRIPTION)
 
-@mcp.tool(description=MAKE_IMG_BLACK_AND_WHITE_DESCRIPTION.model_dump_json())
+@mcp.tool(description=_MAKE_IMG_BLACK_AND_WHITE_DESC_JSON)
 async def make_img_black_and_white(
     puch_image_data: Annotated[str, Field(description="Base64-encoded image data to convert to black and white")] = None,
 ) -> list[TextContent | ImageContent]:
@@ -3,16 +3,19 @@
 
 import asyncio
 from typing import Annotated, Optional, Literal
-import os, uuid, json
-from datetime import datetime
+import os, re, sys, time
+from bisect import bisect_left, insort
+from operator import attrgetter
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta, UTC
 from dotenv import load_dotenv
+import orjson
 
 from fastmcp import FastMCP
 from fastmcp.server.auth.providers.bearer import BearerAuthProvider, RSAKeyPair
 from mcp.server.auth.provider import AccessToken
 from mcp import ErrorData, McpError
 from mcp.types import TextContent, INVALID_PARAMS, INTERNAL_ERROR
-from pydantic import Field, BaseModel  # <-- add BaseModel
 
 # --- Env ---
 load_dotenv()
@@ -44,33 +47,463 @@ mcp = FastMCP(
     auth=SimpleBearerAuthProvider(TOKEN),
 )
 
-# since its a starter, we can use an in memory dict as a db
-TASKS: dict[str, dict[str, dict]] = {}
 
+# --- Task model ---
+# slotted instead of a dict per task: smaller and faster attribute access
+class Task:
+    __slots__ = (
+        "id",
+        "title",
+        "status",
+        "due_us",
+        "priority",
+        "tags",
+        "notes",
+        "created_us",
+        "updated_us",
+        "_search_blob",
+        "_key",
+    )
+
+    # built through _new_task(), which may hand back a pooled instance
+    def _fill(
+        self,
+        id: str,
+        title: str,
+        due_us: int | None,
+        priority: str,
+        tags: tuple[str, ...],
+        notes: str | None,
+        now_us: int,
+    ) -> None:
+        # timestamps are UTC epoch microseconds; ISO strings only in to_dict()
+        self.id = id
+        self.title = title
+        self.status = "open"
+        self.due_us = due_us
+        self.priority = priority
+        self.tags = tags
+        self.notes = notes
+        self.created_us = now_us
+        self.updated_us = now_us
+        # lowercased title + notes cached at write time for list_tasks search;
+        # the NUL separator keeps a query from matching across the two
+        self._search_blob = title.lower() + "\x00" + (notes or "").lower()
+        # list ordering: due_at (undated last), then created_at; id breaks ties.
+        # None of these change after creation, so the key is computed once.
+        self._key = (_NO_DUE if due_us is None else due_us, now_us, id)
+
+    def _clear(self) -> None:
+        # drop references so a pooled task doesn't keep old data alive
+        self.tags = self.notes = None
+        self.title = self._search_blob = ""
+        self._key = ()
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "title": self.title,
+            "status": self.status,
+            "due_at": None if self.due_us is None else _iso(self.due_us),
+            "priority": self.priority,
+            "tags": self.tags,
+            "notes": self.notes,
+            "created_at": _iso_ts(self.created_us),
+            "updated_at": _iso_ts(self.updated_us),
+        }
+
+
+# freelist of removed Task objects, reused by add_task to avoid allocation churn
+_TASK_POOL: list[Task] = []
+_TASK_POOL_MAX = 1024
+
+
+def _new_task(*fields) -> Task:
+    task = _TASK_POOL.pop() if _TASK_POOL else Task.__new__(Task)
+    task._fill(*fields)
+    return task
+
+
+def _release_task(task: Task) -> None:
+    if len(_TASK_POOL) < _TASK_POOL_MAX:
+        task._clear()
+        _TASK_POOL.append(task)
+
+
+# one user's tasks plus the indexes list_tasks reads, all in one shard entry
+class _UserTasks:
+    __slots__ = ("tasks", "ordered", "tags", "lock")
+
+    def __init__(self, lock: asyncio.Lock):
+        self.tasks: dict[str, Task] = {}
+        # kept ordered by _sort_key, so list_tasks never re-sorts
+        self.ordered: list[Task] = []
+        # inverted index: tag -> ids of tasks carrying that tag
+        self.tags: dict[str, set[str]] = {}
+        # the shard's lock, shared with every other user in that shard
+        self.lock = lock
+
+
+# since its a starter, we can use in memory dicts as a db, sharded by user so
+# writes for unrelated users never wait on the same lock.
+# Nothing inside the locked sections awaits yet, so the locks are never
+# contended today; they only start to matter once an await (e.g. async I/O)
+# is added inside one of them.
+_SHARDS = 64  # power of two, see _shard()
+_LIVE_TASKS = 0  # across all users; sizes log compaction
+_TASKS: list[dict[str, _UserTasks]] = [{} for _ in range(_SHARDS)]
+_LOCKS = [asyncio.Lock() for _ in range(_SHARDS)]
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_EPOCH_NAIVE = datetime(1970, 1, 1)
+_ONE_US = timedelta(microseconds=1)
+_NO_DUE = 2**62  # sorts undated tasks after every real due date
+
+
+def _now_us() -> int:
+    return time.time_ns() // 1000
+
+
+# range _iso() can format: datetime's year 1 through year 9999, in UTC
+_MIN_US = (datetime.min.replace(tzinfo=UTC) - _EPOCH) // _ONE_US
+_MAX_US = (datetime.max.replace(tzinfo=UTC) - _EPOCH) // _ONE_US
+
+
+def _parse_iso_us(value: str) -> int:
+    # naive datetimes are taken as UTC; everything is returned as +00:00.
+    # astimezone() raises OverflowError if the UTC value leaves years 1-9999,
+    # which _iso() could not format back
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=UTC)
+    return (dt.astimezone(UTC) - _EPOCH) // _ONE_US
+
+
+def _iso_prefix(sec: int) -> str:
+    # naive so isoformat() leaves the offset off; callers append "+00:00"
+    return (_EPOCH_NAIVE + timedelta(seconds=sec)).isoformat(timespec="seconds")
+
+
+def _iso(us: int) -> str:
+    # used for due dates, which are scattered in time, so nothing is cached
+    sec, frac = divmod(us, 1_000_000)
+    return f"{_iso_prefix(sec)}.{frac:06d}+00:00"
+
+
+# created/updated timestamps cluster in time, so _iso_ts() only re-formats the
+# date/time part when the second changes
+_LAST_SEC = None
+_LAST_PREFIX = ""
+
+
+def _iso_ts(us: int) -> str:
+    global _LAST_SEC, _LAST_PREFIX
+    sec, frac = divmod(us, 1_000_000)
+    if sec != _LAST_SEC:
+        _LAST_SEC = sec
+        _LAST_PREFIX = _iso_prefix(sec)
+    return f"{_LAST_PREFIX}.{frac:06d}+00:00"
+
+
+def _shard(puch_user_id: str) -> int:
+    return hash(puch_user_id) & (_SHARDS - 1)
+
+
+# task ids are 16 random bytes as hex (uuid4 has 122 random bits), sliced from a
+# 4 KiB os.urandom buffer so 256 ids cost one getrandom() syscall
+class _UUIDPool:
+    def __init__(self):
+        self.buf = b""
+        self.off = 0
+
+    def next_hex(self) -> str:
+        if self.off >= len(self.buf):
+            self.buf = os.urandom(4096)
+            self.off = 0
+        h = self.buf[self.off : self.off + 16].hex()
+        self.off += 16
+        return h
+
+
+_uuid_pool = _UUIDPool()
+
+
+# task ids are generated here (see _UUIDPool), so they must be short hex
+_TASK_ID_RE = re.compile(r"\A[0-9a-fA-F-]{1,64}\Z").match
 
-def _now() -> str:
-    return datetime.utcnow().isoformat()
+
+def _check_task_id(task_id: str) -> None:
+    if not task_id or not _TASK_ID_RE(task_id):
+        raise McpError(
+            ErrorData(code=INVALID_PARAMS, message="task_id must be a hex/uuid id")
+        )
+
+
+# puch_user_id is opaque (Puch documents no format), so only bound it: ASCII
+# keeps dict hashing and comparison on CPython's fast path
+_MAX_USER_ID_LEN = 256
 
 
-def _user_tasks(puch_user_id: str) -> dict[str, dict]:
-    if not puch_user_id:
+def _check_user_id(puch_user_id: str) -> None:
+    if (
+        not puch_user_id
+        or len(puch_user_id) > _MAX_USER_ID_LEN
+        or not puch_user_id.isascii()
+    ):
         raise McpError(
-            ErrorData(code=INVALID_PARAMS, message="puch_user_id is required")
+            ErrorData(
+                code=INVALID_PARAMS,
+                message=f"puch_user_id must be 1-{_MAX_USER_ID_LEN} ASCII characters",
+            )
         )
-    return TASKS.setdefault(puch_user_id, {})
+
+
+def _user_tasks(puch_user_id: str) -> _UserTasks:
+    _check_user_id(puch_user_id)
+    s = _shard(puch_user_id)
+    u = _TASKS[s].get(puch_user_id)
+    if u is None:
+        u = _TASKS[s][puch_user_id] = _UserTasks(_LOCKS[s])
+    return u
+
+
+_sort_key = attrgetter("_key")
+
+
+# insort/del on a list need only O(log N) comparisons to find the slot, but the
+# element shift makes each insert/remove O(N); cheap memmove at starter scale
+def _index_task(u: _UserTasks, t: Task) -> None:
+    global _LIVE_TASKS
+    _LIVE_TASKS += 1
+    u.tasks[t.id] = t
+    insort(u.ordered, t, key=_sort_key)
+    for tag in t.tags:
+        u.tags.setdefault(tag, set()).add(t.id)
+
+
+def _unindex_task(u: _UserTasks, t: Task) -> None:
+    global _LIVE_TASKS
+    _LIVE_TASKS -= 1
+    del u.tasks[t.id]
+    ordered = u.ordered
+    del ordered[bisect_left(ordered, _sort_key(t), key=_sort_key)]
+    tags = u.tags
+    for tag in set(t.tags):
+        tids = tags[tag]
+        tids.discard(t.id)
+        if not tids:
+            del tags[tag]
 
 
 def _error(code, msg):
     raise McpError(ErrorData(code=code, message=msg))
 
 
+def _dumps(obj) -> str:
+    return orjson.dumps(obj).decode()
+
+
+# remove_task's confirmation; task ids are validated hex, so no escaping needed
+_REMOVED_PREFIX = '{"removed":"'
+
+
+# --- Persistence (optional append-only log) ---
+# Set TASKS_LOG to a file path to keep tasks across restarts. Every write is
+# appended to the log (one orjson record per line) before it is applied in
+# memory, and the log is replayed on startup. Unset, the store is memory-only.
+# Tasks are still all held in memory either way; the log is for durability.
+TASKS_LOG = os.environ.get("TASKS_LOG")
+_LOG_PATH: str | None = None
+_LOG_FD: int | None = None
+_LOG_DIRTY = False
+_LOG_RECORDS = 0  # records currently in the log file
+_FSYNC_INTERVAL = 0.01  # seconds; one fsync covers every write in the window
+# rewrite the log as a snapshot of live tasks once it holds this many times
+# more records than there are live tasks (and at least _COMPACT_MIN_RECORDS)
+_COMPACT_FACTOR = 4
+_COMPACT_MIN_RECORDS = 10_000
+_COMPACT_RETRY = 60.0  # seconds to wait after a failed compaction
+_COMPACTING = False
+_PENDING: list[bytes] = []  # records appended while a compaction is writing
+
+
+def _encode(record) -> bytes:
+    return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+
+
+def _log_append(*record) -> None:
+    global _LOG_DIRTY, _LOG_RECORDS
+    if _LOG_FD is None:
+        return
+    data = _encode(record)
+    os.write(_LOG_FD, data)
+    if _COMPACTING:
+        _PENDING.append(data)
+    _LOG_DIRTY = True
+    _LOG_RECORDS += 1
+
+
+def _snapshot_records():
+    for shard in _TASKS:
+        for puch_user_id, u in shard.items():
+            for t in u.ordered:
+                yield (
+                    "add",
+                    puch_user_id,
+                    t.id,
+                    t.title,
+                    t.due_us,
+                    t.priority,
+                    t.tags,
+                    t.notes,
+                    t.created_us,
+                )
+                if t.status == "completed":
+                    yield ("complete", puch_user_id, t.id, t.updated_us)
+
+
+def _needs_compaction() -> bool:
+    return _LOG_RECORDS > max(_COMPACT_MIN_RECORDS, _COMPACT_FACTOR * _LIVE_TASKS)
+
+
+def _write_snapshot(tmp: str, data: bytes) -> int:
+    # runs in a worker thread; returns the new file's fd, open for appending
+    fd = os.open(tmp, os.O_WRONLY | os.O_APPEND | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+        os.fsync(fd)
+    except BaseException:
+        os.close(fd)
+        os.unlink(tmp)
+        raise
+    return fd
+
+
+def _fsync_dir(path: str) -> None:
+    dir_fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)  # make a rename inside it durable
+    finally:
+        os.close(dir_fd)
+
+
+async def _compact_log() -> None:
+    # The snapshot is taken on the event loop, so it matches memory exactly.
+    # Writing and fsyncing it happens in a thread; meanwhile tool calls keep
+    # appending to the old file and _log_append also buffers those records in
+    # _PENDING. They are copied into the new file right before the swap, with
+    # no await in between, so nothing is lost or duplicated.
+    global _LOG_FD, _LOG_RECORDS, _LOG_DIRTY, _COMPACTING
+    chunks = [_encode(record) for record in _snapshot_records()]
+    tmp = _LOG_PATH + ".tmp"
+    _COMPACTING = True
+    try:
+        new_fd = await asyncio.to_thread(_write_snapshot, tmp, b"".join(chunks))
+        try:
+            for data in _PENDING:
+                os.write(new_fd, data)
+            os.replace(tmp, _LOG_PATH)
+        except BaseException:
+            os.close(new_fd)
+            raise
+        old_fd, _LOG_FD = _LOG_FD, new_fd
+        os.close(old_fd)
+        _LOG_RECORDS = len(chunks) + len(_PENDING)
+        _LOG_DIRTY = True  # the copied records get fsynced on the next tick
+    finally:
+        _COMPACTING = False
+        _PENDING.clear()
+    await asyncio.to_thread(_fsync_dir, _LOG_PATH)
+
+
+def _log_error(what: str, e: OSError) -> None:
+    print(f"⚠️  task log: {what} failed: {e!r}", file=sys.stderr)
+
+
+async def _fsync_loop() -> None:
+    # I/O errors (ENOSPC, EIO, ...) are reported and retried rather than
+    # ending the loop, which would silently stop all later fsyncs
+    global _LOG_DIRTY
+    loop = asyncio.get_running_loop()
+    next_compact = 0.0
+    while True:
+        await asyncio.sleep(_FSYNC_INTERVAL)
+        if _LOG_DIRTY:
+            _LOG_DIRTY = False
+            try:
+                await asyncio.to_thread(os.fsync, _LOG_FD)
+            except OSError as e:
+                _LOG_DIRTY = True
+                _log_error("fsync", e)
+        if _needs_compaction() and loop.time() >= next_compact:
+            try:
+                await _compact_log()
+            except OSError as e:
+                next_compact = loop.time() + _COMPACT_RETRY
+                _log_error("compaction", e)
+
+
+def _replay_log(path: str) -> int:
+    with open(path, "rb") as f:
+        data = f.read()
+    good = 0
+    records = 0
+    for line in data.splitlines(keepends=True):
+        if not line.endswith(b"\n"):
+            break  # torn final record from a crash mid-write
+        op, puch_user_id, *args = orjson.loads(line)
+        u = _user_tasks(puch_user_id)
+        if op == "add":
+            tid, title, due_us, priority, tags, notes, now_us = args
+            # out-of-range due dates predate add_task rejecting them; indexing
+            # one would make every list_tasks for the user fail, so skip it
+            if due_us is None or _MIN_US <= due_us <= _MAX_US:
+                task = _new_task(
+                    tid, title, due_us, priority, tuple(tags), notes, now_us
+                )
+                _index_task(u, task)
+        elif op == "complete":
+            tid, now_us = args
+            if t := u.tasks.get(tid):
+                t.status = "completed"
+                t.updated_us = now_us
+        elif op == "remove":
+            if t := u.tasks.get(args[0]):
+                _unindex_task(u, t)
+                _release_task(t)
+        good += len(line)
+        records += 1
+    if good < len(data):
+        os.truncate(path, good)
+    return records
+
+
+def _open_log(path: str) -> int:
+    global _LOG_PATH, _LOG_FD, _LOG_RECORDS
+    records = _replay_log(path) if os.path.exists(path) else 0
+    _LOG_PATH = path
+    _LOG_RECORDS = records
+    _LOG_FD = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+    # an oversized log is compacted by _fsync_loop on its first tick
+    return records
+
+
 # --- Rich Tool Description model ---
-class RichToolDescription(BaseModel):
+# plain constants that are only ever serialized, so no pydantic model needed
+@dataclass(frozen=True, slots=True)
+class RichToolDescription:
     description: str
     use_when: str
     side_effects: str | None = None
 
 
+def _desc_json(d: RichToolDescription) -> str:
+    return orjson.dumps(asdict(d)).decode()
+
+
 # --- Tool: validate (required by Puch) ---
 @mcp.tool
 async def validate() -> str:
@@ -108,123 +541,155 @@ REMOVE_TASK_DESCRIPTION = RichToolDescription(
     side_effects="Permanently removes the task from storage.",
 )
 
+# serialized once at import and passed to @mcp.tool below
+_ADD_DESC_JSON = _desc_json(ADD_TASK_DESCRIPTION)
+_LIST_DESC_JSON = _desc_json(LIST_TASKS_DESCRIPTION)
+_GET_DESC_JSON = _desc_json(GET_TASK_DESCRIPTION)
+_COMPLETE_DESC_JSON = _desc_json(COMPLETE_TASK_DESCRIPTION)
+_REMOVE_DESC_JSON = _desc_json(REMOVE_TASK_DESCRIPTION)
+
 
 # --- Tools ---
-@mcp.tool(description=ADD_TASK_DESCRIPTION.model_dump_json())
+@mcp.tool(description=_ADD_DESC_JSON)
 async def add_task(
-    puch_user_id: Annotated[str, Field(description="Puch User Unique Identifier")],
-    title: Annotated[str, Field(description="Task title")],
-    due_at: Annotated[Optional[str], Field(description="ISO 8601 datetime")] = None,
+    puch_user_id: Annotated[str, "Puch User Unique Identifier"],
+    title: Annotated[str, "Task title"],
+    due_at: Annotated[Optional[str], "ISO 8601 datetime"] = None,
     priority: Annotated[
-        Optional[Literal["low", "normal", "high"]], Field(description="Priority")
+        Optional[Literal["low", "normal", "high"]], "Priority"
     ] = "normal",
-    tags: Annotated[Optional[list[str]], Field(description="List of tags")] = None,
-    notes: Annotated[Optional[str], Field(description="Notes")] = None,
+    tags: Annotated[Optional[tuple[str, ...]], "List of tags"] = None,
+    notes: Annotated[Optional[str], "Notes"] = None,
 ) -> list[TextContent]:
     try:
         if not title or not title.strip():
             _error(INVALID_PARAMS, "title cannot be empty")
-        user_tasks = _user_tasks(puch_user_id)
-        tid = str(uuid.uuid4())
-        now = _now()
-        task = {
-            "id": tid,
-            "title": title.strip(),
-            "status": "open",
-            "due_at": due_at,
-            "priority": priority or "normal",
-            "tags": tags or [],
-            "notes": notes,
-            "created_at": now,
-            "updated_at": now,
-        }
-        user_tasks[tid] = task
-        return [TextContent(type="text", text=json.dumps(task))]
+        try:
+            due_us = _parse_iso_us(due_at) if due_at else None
+        except (ValueError, OverflowError):
+            _error(
+                INVALID_PARAMS,
+                f"due_at must be an ISO 8601 datetime in years 1-9999 UTC: {due_at}",
+            )
+        u = _user_tasks(puch_user_id)
+        async with u.lock:
+            tid = _uuid_pool.next_hex()
+            task = _new_task(
+                tid,
+                title.strip(),
+                due_us,
+                priority or "normal",
+                tags or (),
+                notes,
+                _now_us(),
+            )
+            _log_append(
+                "add",
+                puch_user_id,
+                tid,
+                task.title,
+                task.due_us,
+                task.priority,
+                task.tags,
+                task.notes,
+                task.created_us,
+            )
+            _index_task(u, task)
+        return [TextContent(type="text", text=_dumps(task.to_dict()))]
     except McpError:
         raise
     except Exception as e:
         _error(INTERNAL_ERROR, str(e))
 
 
-@mcp.tool(description=LIST_TASKS_DESCRIPTION.model_dump_json())
+@mcp.tool(description=_LIST_DESC_JSON)
 async def list_tasks(
-    puch_user_id: Annotated[str, Field(description="Puch User Unique Identifier")],
+    puch_user_id: Annotated[str, "Puch User Unique Identifier"],
     status: Annotated[
-        Optional[Literal["open", "completed"]], Field(description="Filter by status")
-    ] = None,
-    tag: Annotated[Optional[str], Field(description="Filter by tag")] = None,
-    search: Annotated[
-        Optional[str], Field(description="Substring in title/notes")
+        Optional[Literal["open", "completed"]], "Filter by status"
     ] = None,
+    tag: Annotated[Optional[str], "Filter by tag"] = None,
+    search: Annotated[Optional[str], "Substring in title/notes"] = None,
 ) -> list[TextContent]:
     try:
-        tasks = list(_user_tasks(puch_user_id).values())
-        if status:
-            tasks = [t for t in tasks if t["status"] == status]
+        u = _user_tasks(puch_user_id)
+        if tag:
+            candidates = (u.tasks[i] for i in u.tags.get(tag, ()))
+        else:
+            candidates = u.ordered
+        q = search.lower() if search else None
+        # all filters in one pass, so only one result list is allocated
+        tasks = [
+            t
+            for t in candidates
+            if (not status or t.status == status) and (not q or q in t._search_blob)
+        ]
         if tag:
-            tasks = [t for t in tasks if tag in (t.get("tags") or [])]
-        if search:
-            q = search.lower()
-            tasks = [
-                t
-                for t in tasks
-                if q in t["title"].lower()
-                or (t.get("notes") or "").lower().find(q) != -1
-            ]
-        tasks.sort(
-            key=lambda t: (t.get("due_at") or "9999", t["created_at"])
-        )  # simple sort
-        return [TextContent(type="text", text=json.dumps(tasks))]
+            # tag-index hits are unordered; sort only the tasks that matched
+            tasks.sort(key=_sort_key)
+        return [TextContent(type="text", text=_dumps([t.to_dict() for t in tasks]))]
+    except McpError:
+        raise
     except Exception as e:
         _error(INTERNAL_ERROR, str(e))
 
 
-@mcp.tool(description=GET_TASK_DESCRIPTION.model_dump_json())
+@mcp.tool(description=_GET_DESC_JSON)
 async def get_task(
-    puch_user_id: Annotated[str, Field(description="Puch User Unique Identifier")],
-    task_id: Annotated[str, Field(description="Task ID")],
+    puch_user_id: Annotated[str, "Puch User Unique Identifier"],
+    task_id: Annotated[str, "Task ID"],
 ) -> list[TextContent]:
     try:
-        t = _user_tasks(puch_user_id).get(task_id)
+        _check_task_id(task_id)
+        t = _user_tasks(puch_user_id).tasks.get(task_id)
         if not t:
             _error(INVALID_PARAMS, f"No task {task_id} for user")
-        return [TextContent(type="text", text=json.dumps(t))]
+        return [TextContent(type="text", text=_dumps(t.to_dict()))]
     except McpError:
         raise
     except Exception as e:
         _error(INTERNAL_ERROR, str(e))
 
 
-@mcp.tool(description=COMPLETE_TASK_DESCRIPTION.model_dump_json())
+@mcp.tool(description=_COMPLETE_DESC_JSON)
 async def complete_task(
-    puch_user_id: Annotated[str, Field(description="Puch User Unique Identifier")],
-    task_id: Annotated[str, Field(description="Task ID")],
+    puch_user_id: Annotated[str, "Puch User Unique Identifier"],
+    task_id: Annotated[str, "Task ID"],
 ) -> list[TextContent]:
     try:
-        user_tasks = _user_tasks(puch_user_id)
-        t = user_tasks.get(task_id)
-        if not t:
-            _error(INVALID_PARAMS, f"No task {task_id} for user")
-        t["status"] = "completed"
-        t["updated_at"] = _now()
-        return [TextContent(type="text", text=json.dumps(t))]
+        _check_task_id(task_id)
+        u = _user_tasks(puch_user_id)
+        async with u.lock:
+            t = u.tasks.get(task_id)
+            if not t:
+                _error(INVALID_PARAMS, f"No task {task_id} for user")
+            now_us = _now_us()
+            _log_append("complete", puch_user_id, task_id, now_us)
+            t.status = "completed"
+            t.updated_us = now_us
+        return [TextContent(type="text", text=_dumps(t.to_dict()))]
     except McpError:
         raise
     except Exception as e:
         _error(INTERNAL_ERROR, str(e))
 
 
-@mcp.tool(description=REMOVE_TASK_DESCRIPTION.model_dump_json())
+@mcp.tool(description=_REMOVE_DESC_JSON)
 async def remove_task(
-    puch_user_id: Annotated[str, Field(description="Puch User Unique Identifier")],
-    task_id: Annotated[str, Field(description="Task ID")],
+    puch_user_id: Annotated[str, "Puch User Unique Identifier"],
+    task_id: Annotated[str, "Task ID"],
 ) -> list[TextContent]:
     try:
-        user_tasks = _user_tasks(puch_user_id)
-        if task_id not in user_tasks:
-            _error(INVALID_PARAMS, f"No task {task_id} for user")
-        del user_tasks[task_id]
-        return [TextContent(type="text", text=json.dumps({"removed": task_id}))]
+        _check_task_id(task_id)
+        u = _user_tasks(puch_user_id)
+        async with u.lock:
+            t = u.tasks.get(task_id)
+            if not t:
+                _error(INVALID_PARAMS, f"No task {task_id} for user")
+            _log_append("remove", puch_user_id, task_id)
+            _unindex_task(u, t)
+            _release_task(t)
+        return [TextContent(type="text", text=_REMOVED_PREFIX + task_id + '"}')]
     except McpError:
         raise
     except Exception as e:
@@ -233,8 +698,27 @@ async def remove_task(
 
 # --- Run MCP Server ---
 async def main():
-    print("🧭 Starting Task MCP server on http://0.0.0.0:8086  (in-memory store)")
-    await mcp.run_async("streamable-http", host="0.0.0.0", port=8086)
+    store = "in-memory store"
+    fsync_task = None
+    if TASKS_LOG:
+        records = _open_log(TASKS_LOG)
+        # keep a reference so the fsync task is not garbage collected
+        fsync_task = asyncio.create_task(_fsync_loop())
+        store = f"log {TASKS_LOG}, {records} records replayed"
+    print(f"🧭 Starting Task MCP server on http://0.0.0.0:8086  ({store})")
+    try:
+        await mcp.run_async("streamable-http", host="0.0.0.0", port=8086)
+    finally:
+        if fsync_task is not None:
+            fsync_task.cancel()
+            try:
+                await fsync_task
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                # the loop survives I/O errors, so this is an unexpected crash
+                print(f"⚠️  task log: fsync loop crashed: {e!r}", file=sys.stderr)
+            os.fsync(_LOG_FD)  # flush whatever the last interval left unsynced
 
 
 if __name__ == "__main__":